@@ -5,12 +5,13 @@ import time
 import os
 import logging
 from enum import Enum
+from string import Template
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QLabel,
     QPushButton, QLineEdit, QStackedWidget, QMessageBox, QComboBox, 
-    QProgressBar, QHBoxLayout, QCheckBox
+    QProgressBar, QHBoxLayout, QCheckBox, QInputDialog
 )
-from PyQt6.QtCore import Qt, QTimer, QSize
+from PyQt6.QtCore import Qt, QTimer, QSize, QEvent
 from PyQt6.QtGui import QFont, QAction
 
 # Konfiguriere das Logging
@@ -50,12 +51,118 @@ def get_tip_of_the_day():
     ]
     return random.choice(tips)
 
+# Farbpaletten der verfügbaren Themen
+THEMES = {
+    "Dunkel": {
+        "background": "#222",
+        "text": "white",
+        "title": "#2c3e50",
+        "score": "yellow",
+        "statistics": "white",
+        "achievement": "lightgreen",
+        "primary": "#008080",
+        "danger": "#d35400",
+        "success": "#27ae60",
+        "button_text": "white",
+    },
+    "Hell": {
+        "background": "#f5f5f5",
+        "text": "#222",
+        "title": "#2c3e50",
+        "score": "#b7950b",
+        "statistics": "#222",
+        "achievement": "#1e8449",
+        "primary": "#008080",
+        "danger": "#d35400",
+        "success": "#27ae60",
+        "button_text": "white",
+    },
+    "Hoher Kontrast": {
+        "background": "black",
+        "text": "white",
+        "title": "yellow",
+        "score": "yellow",
+        "statistics": "white",
+        "achievement": "#00ff00",
+        "primary": "#0000cd",
+        "danger": "#b22222",
+        "success": "#006400",
+        "button_text": "white",
+    },
+}
+
+# Skalierungsfaktoren für die Schriftgröße
+FONT_SCALES = {
+    "Klein": 0.85,
+    "Normal": 1.0,
+    "Groß": 1.25,
+    "Sehr groß": 1.5,
+}
+
+# Basisgrößen der Schrift in Pixel (Skalierungsfaktor 1.0)
+FONT_SIZES = {
+    "font_base": 16,
+    "font_input": 18,
+    "font_info": 20,
+    "font_answer": 24,
+    "font_title": 32,
+}
+
+DEFAULT_THEME = "Dunkel"
+DEFAULT_FONT_SCALE = "Normal"
+
+# Anwendungsweites Stylesheet. Widgets werden über die Eigenschaft "role" ausgewählt,
+# damit Qt die Stile nur einmal für die gesamte Anwendung parsen muss.
+STYLESHEET_TEMPLATE = """
+QWidget { background-color: $background; color: $text; font-size: ${font_base}px; }
+QLineEdit, QComboBox, QCheckBox { font-size: ${font_input}px; }
+QLineEdit[role="answer"] { font-size: ${font_answer}px; }
+QLabel[role="title"] { font-size: ${font_title}px; font-weight: 700; color: $title; }
+QLabel[role="score"] { font-size: ${font_info}px; color: $score; }
+QLabel[role="statistics"] { font-size: ${font_answer}px; color: $statistics; }
+QLabel[role="achievement"] { font-size: ${font_info}px; color: $achievement; }
+QPushButton[role="primary"], QPushButton[role="danger"], QPushButton[role="success"] {
+    color: $button_text; padding: 10px; border-radius: 10px;
+}
+QPushButton[role="primary"] { background-color: $primary; }
+QPushButton[role="danger"] { background-color: $danger; }
+QPushButton[role="success"] { background-color: $success; }
+"""
+
+# Bereits erzeugte Stylesheets dieser Sitzung, Schlüssel: (Thema, Schriftgröße)
+_stylesheet_cache = {}
+
+def stylesheet_values(theme, font_scale):
+    """
+    Liefert alle Werte, die in die Stylesheet-Vorlage eingesetzt werden.
+    """
+    values = dict(THEMES[theme])
+    factor = FONT_SCALES[font_scale]
+    for key, size in FONT_SIZES.items():
+        values[key] = round(size * factor)
+    return values
+
+def build_stylesheet(values):
+    """
+    Erzeugt das Stylesheet aus den Werten von stylesheet_values().
+    """
+    return Template(STYLESHEET_TEMPLATE).substitute(values)
+
+def get_stylesheet(theme, font_scale):
+    """
+    Liefert das Stylesheet für Thema und Schriftgröße.
+    Erzeugte Stylesheets werden für die Dauer der Sitzung zwischengespeichert.
+    """
+    key = (theme, font_scale)
+    if key not in _stylesheet_cache:
+        _stylesheet_cache[key] = build_stylesheet(stylesheet_values(theme, font_scale))
+    return _stylesheet_cache[key]
+
 class MathTrainer(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Mathe Trainer Pro")
         self.setGeometry(100, 100, 800, 600)
-        self.setStyleSheet("background-color: #222; color: white; font-size: 16px;")
         
         # Initiale Variablen
         self.current_solution = None
@@ -71,6 +178,10 @@ class MathTrainer(QMainWindow):
         self.user_profiles = self.load_profiles()
         self.current_user = None
 
+        # Thema vor dem Erstellen der Widgets setzen, damit diese nur einmal gestylt werden
+        self.settings = self.load_settings()
+        self.apply_theme()
+
         # Timer initialisieren
         self.timer = QTimer()
         self.timer.timeout.connect(self.time_out)
@@ -112,10 +223,71 @@ class MathTrainer(QMainWindow):
         settings_menu.addAction(reset_action)
     
     def change_theme(self):
-        QMessageBox.information(self, "Thema ändern", "Die Funktion 'Thema ändern' ist noch nicht implementiert.")
+        themes = list(THEMES)
+        current = themes.index(self.settings["theme"])
+        theme, ok = QInputDialog.getItem(self, "Thema ändern", "Thema auswählen:", themes, current, False)
+        if ok and theme != self.settings["theme"]:
+            self.settings["theme"] = theme
+            self.apply_theme()
+            self.save_settings()
     
     def change_font_size(self):
-        QMessageBox.information(self, "Schriftgröße anpassen", "Die Funktion 'Schriftgröße anpassen' ist noch nicht implementiert.")
+        scales = list(FONT_SCALES)
+        current = scales.index(self.settings["font_scale"])
+        font_scale, ok = QInputDialog.getItem(self, "Schriftgröße anpassen", "Schriftgröße auswählen:", scales, current, False)
+        if ok and font_scale != self.settings["font_scale"]:
+            self.settings["font_scale"] = font_scale
+            self.apply_theme()
+            self.save_settings()
+    
+    def apply_theme(self):
+        """
+        Setzt das Stylesheet für die gesamte Anwendung in einem Schritt und
+        protokolliert die Dauer für das Umschalten und das anschließende Neuzeichnen.
+        Die Zeit für das Neuzeichnen umfasst auch die zurückgestellte Neuberechnung
+        des Layouts, aber keine anderen wartenden Ereignisse (z. B. den Aufgaben-Timer).
+        """
+        theme = self.settings["theme"]
+        font_scale = self.settings["font_scale"]
+
+        start = time.perf_counter()
+        stylesheet = get_stylesheet(theme, font_scale)
+        QApplication.instance().setStyleSheet(stylesheet)
+        apply_ms = (time.perf_counter() - start) * 1000
+        if self.isVisible():
+            start = time.perf_counter()
+            QApplication.sendPostedEvents(None, QEvent.Type.LayoutRequest.value)
+            self.repaint()
+            repaint_ms = (time.perf_counter() - start) * 1000
+            logging.info("Thema '%s' (Schrift: %s) angewendet in %.1f ms, Neuzeichnen %.1f ms",
+                         theme, font_scale, apply_ms, repaint_ms)
+        else:
+            logging.info("Thema '%s' (Schrift: %s) angewendet in %.1f ms", theme, font_scale, apply_ms)
+    
+    def load_settings(self):
+        settings = {"theme": DEFAULT_THEME, "font_scale": DEFAULT_FONT_SCALE}
+        try:
+            settings_path = resource_path("settings.json")
+            with open(settings_path, "r") as f:
+                stored = json.load(f)
+            # Unbekannte Werte (z. B. entfernte Themen) werden ignoriert
+            if stored.get("theme") in THEMES:
+                settings["theme"] = stored["theme"]
+            if stored.get("font_scale") in FONT_SCALES:
+                settings["font_scale"] = stored["font_scale"]
+            logging.info("Einstellungen erfolgreich geladen")
+        except Exception as e:
+            logging.warning("Einstellungen nicht gefunden oder fehlerhaft: %s", e)
+        return settings
+    
+    def save_settings(self):
+        try:
+            settings_path = resource_path("settings.json")
+            with open(settings_path, "w") as f:
+                json.dump(self.settings, f)
+            logging.info("Einstellungen gespeichert")
+        except OSError as e:
+            logging.warning("Einstellungen konnten nicht gespeichert werden: %s", e)
     
     def reset_progress(self):
         reply = QMessageBox.question(self, 'Fortschritt zurücksetzen',
@@ -163,40 +335,35 @@ class MathTrainer(QMainWindow):
         
         title = QLabel("Mathe Trainer Pro")
         title.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        title.setStyleSheet("font-size: 32px; font-weight: 700; color: #2c3e50;")
+        title.setProperty("role", "title")
         layout.addWidget(title)
 
         self.name_input = QLineEdit()
         self.name_input.setPlaceholderText("Dein Name...")
-        self.name_input.setStyleSheet("font-size: 18px;")
         self.name_input.setToolTip("Gib deinen Namen ein")
         layout.addWidget(self.name_input)
         
         self.class_selection = QComboBox()
         self.class_selection.addItems(["Klasse 1", "Klasse 2", "Klasse 3", "Klasse 4"])
-        self.class_selection.setStyleSheet("font-size: 18px;")
         self.class_selection.setToolTip("Wähle deine Klassenstufe aus")
         layout.addWidget(self.class_selection)
 
         self.difficulty_selection = QComboBox()
         self.difficulty_selection.addItems(["Einfach", "Mittel", "Schwer"])
-        self.difficulty_selection.setStyleSheet("font-size: 18px;")
         self.difficulty_selection.setToolTip("Wähle den Schwierigkeitsgrad")
         layout.addWidget(self.difficulty_selection)
 
         self.timer_checkbox = QCheckBox("Timer deaktivieren")
-        self.timer_checkbox.setStyleSheet("font-size: 18px;")
         self.timer_checkbox.setToolTip("Aktiviere oder deaktiviere den Timer pro Aufgabe")
         layout.addWidget(self.timer_checkbox)
         
         self.num_problems_input = QLineEdit()
         self.num_problems_input.setPlaceholderText("Anzahl der Aufgaben (Standard: 10)")
-        self.num_problems_input.setStyleSheet("font-size: 18px;")
         self.num_problems_input.setToolTip("Gib die Anzahl der Aufgaben pro Sitzung ein")
         layout.addWidget(self.num_problems_input)
 
         start_btn = QPushButton("Jetzt starten!")
-        start_btn.setStyleSheet("background-color: #008080; color: white; padding: 10px; border-radius: 10px;")
+        start_btn.setProperty("role", "primary")
         start_btn.clicked.connect(self.start_trainer)
         layout.addWidget(start_btn)
         
@@ -210,20 +377,20 @@ class MathTrainer(QMainWindow):
 
         self.problem_label = QLabel("Aufgabe: ?")
         self.problem_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.problem_label.setStyleSheet("font-size: 32px; font-weight: 700; color: #2c3e50;")
+        self.problem_label.setProperty("role", "title")
         layout.addWidget(self.problem_label)
 
         self.answer_input = QLineEdit()
         self.answer_input.setPlaceholderText("Antwort eingeben...")
         self.answer_input.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.answer_input.setStyleSheet("font-size: 24px;")
+        self.answer_input.setProperty("role", "answer")
         self.answer_input.setToolTip("Gib deine Antwort hier ein")
         # Bei Drücken der Eingabetaste wird Antwort geprüft
         self.answer_input.returnPressed.connect(self.check_answer)
         layout.addWidget(self.answer_input)
 
         check_btn = QPushButton("Antwort prüfen")
-        check_btn.setStyleSheet("background-color: #008080; color: white; padding: 10px; border-radius: 10px;")
+        check_btn.setProperty("role", "primary")
         check_btn.clicked.connect(self.check_answer)
         layout.addWidget(check_btn)
         
@@ -234,11 +401,11 @@ class MathTrainer(QMainWindow):
 
         self.highscore_label = QLabel("Punkte: 0 | Level: 1")
         self.highscore_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.highscore_label.setStyleSheet("font-size: 20px; color: yellow;")
+        self.highscore_label.setProperty("role", "score")
         layout.addWidget(self.highscore_label)
         
         self.back_button = QPushButton("Zurück zum Hauptmenü")
-        self.back_button.setStyleSheet("background-color: #d35400; color: white; padding: 10px; border-radius: 10px;")
+        self.back_button.setProperty("role", "danger")
         self.back_button.clicked.connect(self.go_to_main_menu)
         layout.addWidget(self.back_button)
         
@@ -253,26 +420,26 @@ class MathTrainer(QMainWindow):
 
         self.result_label = QLabel("Ergebnisse")
         self.result_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.result_label.setStyleSheet("font-size: 32px; font-weight: 700; color: #2c3e50;")
+        self.result_label.setProperty("role", "title")
         layout.addWidget(self.result_label)
 
         self.statistics_label = QLabel("")
         self.statistics_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.statistics_label.setStyleSheet("font-size: 24px; color: white;")
+        self.statistics_label.setProperty("role", "statistics")
         layout.addWidget(self.statistics_label)
 
         self.achievement_label = QLabel("")
         self.achievement_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.achievement_label.setStyleSheet("font-size: 20px; color: lightgreen;")
+        self.achievement_label.setProperty("role", "achievement")
         layout.addWidget(self.achievement_label)
 
         self.restart_button = QPushButton("Erneut spielen")
-        self.restart_button.setStyleSheet("background-color: #27ae60; color: white; padding: 10px; border-radius: 10px;")
+        self.restart_button.setProperty("role", "success")
         self.restart_button.clicked.connect(self.restart_game)
         layout.addWidget(self.restart_button)
         
         self.back_to_menu_button = QPushButton("Zum Hauptmenü")
-        self.back_to_menu_button.setStyleSheet("background-color: #d35400; color: white; padding: 10px; border-radius: 10px;")
+        self.back_to_menu_button.setProperty("role", "danger")
         self.back_to_menu_button.clicked.connect(self.go_to_main_menu)
         layout.addWidget(self.back_to_menu_button)
 